@@ -5,10 +5,28 @@ Simulates malware scanning, suspicious file detection, and audit logging.
 """
 import hashlib
 import json
+import os
+import re
 from pathlib import Path
 from datetime import datetime
 from safe_file_walker import SafeFileWalker, SafeWalkConfig
 
+# Size of the file prefix used for the quick hash
+QUICK_HASH_BYTES = 65536
+# O_NOATIME avoids an inode atime write per scanned file (Linux only);
+# O_BINARY is required on Windows to read raw bytes
+_OPEN_FLAGS = os.O_RDONLY | getattr(os, 'O_BINARY', 0)
+_O_NOATIME = getattr(os, 'O_NOATIME', 0)
+
+SUSPICIOUS_PATTERNS = (
+    'malware', 'virus', 'trojan', 'ransomware',
+    '.exe', '.bat', '.cmd', '.ps1', '.sh',
+    'password', 'secret', 'confidential'
+)
+# One alternation scans each name once instead of once per pattern
+_SUSPICIOUS_RE = re.compile('|'.join(map(re.escape, SUSPICIOUS_PATTERNS)))
+_EXE_SUFFIXES = frozenset({'.exe', '.bat', '.cmd', '.sh', '.py'})
+
 
 class SecurityScanner:
     """Example security scanner using safe-file-walker."""
@@ -24,39 +42,50 @@ class SecurityScanner:
             'start_time': None,
             'end_time': None
         }
+        self._hash_cls = hashlib.sha256
     
     def _is_suspicious_filename(self, filename):
         """Check for suspicious file patterns."""
-        suspicious_patterns = [
-            'malware', 'virus', 'trojan', 'ransomware',
-            '.exe', '.bat', '.cmd', '.ps1', '.sh',
-            'password', 'secret', 'confidential'
-        ]
-        filename_lower = filename.lower()
-        return any(pattern in filename_lower for pattern in suspicious_patterns)
+        return _SUSPICIOUS_RE.search(filename.lower()) is not None
     
     def _is_executable(self, filepath):
         """Check if file is executable (simplified)."""
-        return filepath.suffix.lower() in {'.exe', '.bat', '.cmd', '.sh', '.py'}
+        return filepath.suffix.lower() in _EXE_SUFFIXES
     
     def _calculate_file_hash(self, filepath):
-        """Calculate SHA256 hash of file (for known malware detection)."""
+        """Calculate SHA256 hash of file (for known malware detection).
+
+        Only the first 64KB are hashed. The prefix is read with a single
+        ``os.read`` on a raw descriptor, bypassing Python's buffered file
+        object.
+        """
         try:
-            hasher = hashlib.sha256()
-            with open(filepath, 'rb') as f:
-                # Read first 64KB for quick hash
-                chunk = f.read(65536)
-                hasher.update(chunk)
-            return hasher.hexdigest()
-        except (OSError, IOError):
+            try:
+                fd = os.open(filepath, _OPEN_FLAGS | _O_NOATIME)
+            except PermissionError:
+                if not _O_NOATIME:
+                    raise
+                # O_NOATIME is only allowed for the file owner
+                fd = os.open(filepath, _OPEN_FLAGS)
+            try:
+                data = os.read(fd, QUICK_HASH_BYTES)
+            finally:
+                os.close(fd)
+            return self._hash_cls(data).hexdigest()
+        except OSError:
             return None
     
-    def scan_file(self, filepath):
-        """Analyze a single file for security issues."""
+    def scan_file(self, filepath, stat=None):
+        """Analyze a single file for security issues.
+
+        ``stat`` may be passed from ``walker.iter_with_stat()`` to avoid a
+        second ``stat()`` call per file.
+        """
         self.scan_stats['files_scanned'] += 1
         
         try:
-            stat = filepath.stat()
+            if stat is None:
+                stat = filepath.stat()
             findings = []
             
             # Check file size
@@ -111,8 +140,8 @@ class SecurityScanner:
         # Run the scan
         with SafeFileWalker(config) as walker:
             file_count = 0
-            for filepath in walker:
-                self.scan_file(filepath)
+            for filepath, stat in walker.iter_with_stat():
+                self.scan_file(filepath, stat)
                 file_count += 1
                 
                 # Progress indicator
@@ -206,20 +235,19 @@ def example_with_custom_rules():
     print("\n=== Custom Security Rules ===")
     
     class CustomScanner(SecurityScanner):
+        # Add custom rules
+        custom_re = re.compile('|'.join(map(re.escape, [
+            'backup', 'archive', 'temp',
+            '.log', '.tmp', '.cache'
+        ])))
+
         def _is_suspicious_filename(self, filename):
-            # Add custom rules
-            custom_patterns = [
-                'backup', 'archive', 'temp',
-                '.log', '.tmp', '.cache'
-            ]
-            filename_lower = filename.lower()
-            
             # Check for suspicious patterns
             if super()._is_suspicious_filename(filename):
                 return True
             
             # Check for custom patterns
-            return any(pattern in filename_lower for pattern in custom_patterns)
+            return self.custom_re.search(filename.lower()) is not None
     
     scanner = CustomScanner(".")
     scanner.run_scan()
@@ -1,7 +1,7 @@
 # safe_file_walker.py
 """
 Безопасный итератор файлов с защитой от:
-- Path Traversal (через is_relative_to)
+- Path Traversal (строковая проверка префикса разрешённого root; проверяются цели symlink)
 - Symlink- и hardlink-атак
 - DoS через бесконечную рекурсию или высокую нагрузку
 - Race condition при проверке путей
@@ -16,12 +16,19 @@
 """
 
 import os
+import queue
+import random
 import stat
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from pathlib import Path
-from typing import Iterator, Optional, Callable, Deque, Tuple
+from typing import Any, Iterable, Iterator, Literal, NamedTuple, Optional, Callable, Deque, Tuple, Union
+from array import array
 from collections import deque
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from enum import Enum
+from operator import attrgetter, methodcaller
 
 
 def _validate_positive(value: float, name: str) -> None:
@@ -30,7 +37,77 @@ def _validate_positive(value: float, name: str) -> None:
         raise ValueError(f"{name} must be positive")
 
 
-__all__ = ['SafeWalkConfig', 'WalkStats', 'SafeFileWalker']
+__all__ = ['SafeWalkConfig', 'WalkStats', 'WalkStatsView', 'SkipReason', 'SafeFileWalker']
+
+_INF = float("inf")
+
+# Быстрое разрешение symlink через readlink рассчитано на POSIX-пути;
+# на Windows readlink может вернуть путь с префиксом \\?\, там используется realpath
+_FAST_SYMLINK_RESOLVE = os.name == "posix"
+
+# Максимальная длительность одной паузы rate limiting, сек
+_MAX_RATE_SLEEP = 1.0
+
+# Таймаут проверяется раз в (маска + 1) элементов каталога; при коротком
+# лимите — на каждом элементе, иначе промах составил бы заметную долю лимита
+_TIMEOUT_CHECK_MASK = 0x3FF
+_SHORT_TIMEOUT_SEC = 60.0
+
+# Множитель Фибоначчи-хеширования (2**64 / φ) для таблицы inode
+_FIB_MULT = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+# Начальный размер таблицы inode — 2**_INODE_MIN_BITS слотов
+_INODE_MIN_BITS = 10
+
+# Ключ сортировки записей каталога: attrgetter реализован на C — без
+# Python-фрейма на каждый ключ; создаётся один раз на модуль
+_BY_NAME = attrgetter('name')
+
+
+def _inode_or_zero(entry: os.DirEntry) -> int:
+    """
+    Ключ сортировки по inode, не падающий на отдельном элементе.
+
+    На Windows ``DirEntry.inode()`` делает системный вызов и может бросить
+    OSError (например, файл удалён после чтения каталога). Такой элемент
+    сортируется первым, а не срывает чтение всего каталога как scan_failed;
+    его ошибка всплывёт позже, в обычной обработке элемента.
+    """
+    try:
+        return entry.inode()
+    except OSError:
+        return 0
+
+
+# Порядок по d_ino: номер inode приходит из getdents64 вместе с именем, без
+# stat, и inode() на POSIX не бросает исключений. На ext4/xfs последующие
+# lstat/open идут по таблице inode подряд
+_BY_INODE: Callable[[os.DirEntry], int] = _inode_or_zero if os.name == "nt" else methodcaller('inode')
+
+# Обработчик пропуска: (путь, причина, is_dir)
+_SkipFn = Callable[[str, str, bool], None]
+# Событие многопоточного обхода: (путь, lstat файла, причина пропуска, is_dir)
+_WalkEvent = Tuple[str, Optional[os.stat_result], Optional[str], bool]
+
+
+class SkipReason(str, Enum):
+    """
+    Причина пропуска, передаваемая в ``on_skip``.
+
+    Члены — заранее созданные синглтоны: на пропуск не форматируется строка.
+    Наследование от ``str`` сохраняет совместимость с кодом, который
+    сравнивает причину со строкой или вызывает у неё строковые методы.
+    Ошибки ввода-вывода передаются строкой вида ``"stat_failed: <тип>"`` /
+    ``"scan_failed: <тип>"`` с именем исключения.
+    """
+    SYMLINK_BLOCKED = "symlink_blocked"
+    BROKEN_SYMLINK = "broken_symlink"
+    TRAVERSAL_VIA_SYMLINK = "traversal_via_symlink"
+    MAX_DEPTH_EXCEEDED = "max_depth_exceeded"
+    HARDLINK_DUPLICATE = "hardlink_duplicate_or_cache_full"
+
+    # str()/f-строки дают само значение, как и до появления перечисления
+    __str__ = str.__str__
 
 
 @dataclass(frozen=True, slots=True)
@@ -41,15 +118,34 @@ class SafeWalkConfig:
     Attributes:
         root: Абсолютный путь к корневой директории (обязательно абсолютный).
         max_rate_mb_per_sec: Максимальная скорость обработки данных в МБ/сек (должна быть положительной).
+                             float("inf") отключает rate limiting.
         follow_symlinks: Следовать ли по символическим ссылкам (по умолчанию — нет).
         timeout_sec: Максимальное время выполнения обхода в секундах (должно быть положительным).
+                     float("inf") отключает проверку таймаута.
         max_depth: Максимальная глубина рекурсии (None — без ограничений).
                    0 = только корень, 1 = корень + прямые подкаталоги и т.д.
         max_unique_files: Максимальное количество уникальных файлов в кэше (LRU).
+                          0 отключает дедупликацию по hardlink.
         deterministic: Сохранять ли детерминированный порядок обхода (по умолчанию True).
                        Отключение экономит память на крупных директориях.
         on_skip: Коллбэк, вызываемый при пропуске файла/директории.
-                 Принимает (путь: Path, причина: str).
+                 Принимает (путь: Path, причина: str) — как правило, член
+                 SkipReason (подкласс str).
+        num_threads: Количество потоков для чтения каталогов (по умолчанию 1).
+                     При значении > 1 scandir/lstat выполняются пулом потоков.
+                     С сортировкой (order "name"/"inode") порядок тот же, что
+                     у однопоточного обхода; при order="raw" порядок между
+                     каталогами не гарантируется.
+        burst_seconds: Ёмкость token bucket в секундах работы на max_rate_mb_per_sec
+                       (должна быть положительной). Объём до этого размера
+                       проходит без пауз.
+        order: Порядок элементов внутри каталога: "name" — по имени, "inode" —
+               по номеру inode (локальность на диске), "raw" — как вернула ФС,
+               потоково. None (по умолчанию) — "name" при deterministic=True,
+               иначе "raw". Явное значение имеет приоритет над deterministic.
+        clock: Монотонные часы в секундах для таймаута, rate limiting и
+               статистики (по умолчанию time.monotonic). Позволяет тестам
+               подставить свои часы без патчинга модуля time.
     """
     root: Path
     max_rate_mb_per_sec: float = 10.0
@@ -59,12 +155,36 @@ class SafeWalkConfig:
     max_unique_files: int = 1_000_000
     deterministic: bool = True
     on_skip: Optional[Callable[[Path, str], None]] = None
+    num_threads: int = 1
+    burst_seconds: float = 1.0
+    order: Optional[Literal["name", "inode", "raw"]] = None
+    clock: Callable[[], float] = time.monotonic
+    # Разрешённый root в виде строки-префикса с os.sep на конце; вычисляется
+    # один раз в __post_init__, обходчик проверяет границу только через startswith
+    _root_str: str = field(init=False, repr=False, compare=False)
 
+    def __post_init__(self):
+        if not isinstance(self.root, Path):
+            raise TypeError("root must be a pathlib.Path")
+        if not self.root.is_absolute():
+            raise ValueError("Root path must be absolute")
+        # Единственный resolve() за время жизни конфигурации
+        try:
+            resolved = self.root.resolve(strict=False)
+        except (OSError, RuntimeError) as e:
+            raise ValueError(f"Cannot resolve root path: {self.root}") from e
+        root_str = os.fspath(resolved)
+        object.__setattr__(self, 'root', resolved)
+        # Для "/" разделитель уже на конце
+        object.__setattr__(self, '_root_str', root_str if root_str.endswith(os.sep) else root_str + os.sep)
 
-@dataclass(frozen=True, slots=True)
-class WalkStats:
+
+class WalkStats(NamedTuple):
     """
     Статистика выполнения обхода.
+
+    NamedTuple: неизменяемый снимок хранится как C-кортеж без ``__dict__``,
+    стандартный ``__repr__`` уже даёт ``WalkStats(files_yielded=..., ...)``.
     """
     files_yielded: int = 0
     files_skipped: int = 0
@@ -81,15 +201,6 @@ class WalkStats:
             f"Time: {self.time_elapsed:.2f}s"
         )
 
-    def __repr__(self) -> str:
-        return (
-            f"WalkStats(files_yielded={self.files_yielded}, "
-            f"files_skipped={self.files_skipped}, "
-            f"dirs_skipped={self.dirs_skipped}, "
-            f"bytes_processed={self.bytes_processed}, "
-            f"time_elapsed={self.time_elapsed!r})"
-        )
-
 
 @dataclass(slots=True)
 class _InternalStats:
@@ -103,6 +214,209 @@ class _InternalStats:
     start_time: float = 0.0
 
 
+class _InodeTable:
+    """
+    Множество (st_dev, st_ino) ограниченного размера с вытеснением самых старых.
+
+    Открытая адресация с линейным пробированием поверх двух ``array('Q')``:
+    16 байт на слот вместо Python-объектов int и узлов OrderedDict (около
+    50 МБ против 127 МБ на 1M записей). Таблица растёт удвоением, держит
+    заполнение не выше 1/2 и не выделяет память под max_unique_files заранее.
+    Порядок вставки для вытеснения хранится в кольцевом буфере тех же
+    ``array('Q')``; удаление — обратным сдвигом, без надгробий.
+
+    Пары, не помещающиеся в 64 бита без знака (128-битный st_ino на ReFS /
+    Dev Drive в Windows, отрицательные значения), хранятся целиком в
+    отдельном dict с тем же лимитом и тем же вытеснением самых старых.
+    """
+
+    __slots__ = (
+        '_limit',
+        '_shift',
+        '_mask',
+        '_devs',
+        '_inos',
+        '_used',
+        '_size',
+        '_order_devs',
+        '_order_inos',
+        '_head',
+        '_wide',
+    )
+
+    def __init__(self, limit: int):
+        self._limit = limit
+        self.clear()
+
+    def _alloc(self, bits: int) -> None:
+        """Выделяет пустую таблицу на 2**bits слотов."""
+        cap = 1 << bits
+        # Индекс слота — старшие bits бит 64-битного произведения
+        self._shift = 64 - bits
+        self._mask = cap - 1
+        self._devs = array('Q', bytes(8 * cap))
+        self._inos = array('Q', bytes(8 * cap))
+        # Отдельный признак занятости: нулевые dev/ino не годятся в маркеры
+        self._used = bytearray(cap)
+        self._size = 0
+
+    def clear(self) -> None:
+        """Освобождает таблицу и возвращает её к начальному размеру."""
+        self._order_devs = array('Q')
+        self._order_inos = array('Q')
+        self._head = 0
+        self._wide: dict[Tuple[int, int], None] = {}
+        self._alloc(_INODE_MIN_BITS)
+
+    def add(self, dev: int, ino: int) -> bool:
+        """
+        Добавляет (dev, ino), при переполнении вытесняя самую старую запись.
+
+        Returns:
+            True если пара новая, False если уже была в таблице.
+        """
+        # Отрицательное значение или значение от 2**64 не влезет в array('Q')
+        if (dev | ino) >> 64:
+            return self._add_wide(dev, ino)
+        used = self._used
+        i = (((ino ^ dev) * _FIB_MULT) & _MASK64) >> self._shift
+        if used[i]:
+            devs = self._devs
+            inos = self._inos
+            mask = self._mask
+            while used[i]:
+                if inos[i] == ino and devs[i] == dev:
+                    return False
+                i = (i + 1) & mask
+
+        order_devs = self._order_devs
+        if len(order_devs) < self._limit:
+            order_devs.append(dev)
+            self._order_inos.append(ino)
+            if 2 * (self._size + 1) > self._mask + 1:
+                self._grow()
+                self._insert(dev, ino)
+                return True
+        else:
+            # Кэш полон: место самой старой записи занимает новая
+            head = self._head
+            self._remove(order_devs[head], self._order_inos[head])
+            order_devs[head] = dev
+            self._order_inos[head] = ino
+            self._head = (head + 1) % self._limit
+            # Обратный сдвиг мог переместить записи — ищем слот заново
+            self._insert(dev, ino)
+            return True
+
+        used[i] = 1
+        self._devs[i] = dev
+        self._inos[i] = ino
+        self._size += 1
+        return True
+
+    def _add_wide(self, dev: int, ino: int) -> bool:
+        """``add`` для пар вне 64 бит: полный ключ в dict, вытеснение по порядку вставки."""
+        key = (dev, ino)
+        wide = self._wide
+        if key in wide:
+            return False
+        if len(wide) >= self._limit:
+            del wide[next(iter(wide))]
+        wide[key] = None
+        return True
+
+    def _insert(self, dev: int, ino: int) -> None:
+        """Вставляет заведомо отсутствующую пару в первый свободный слот."""
+        used = self._used
+        mask = self._mask
+        i = (((ino ^ dev) * _FIB_MULT) & _MASK64) >> self._shift
+        while used[i]:
+            i = (i + 1) & mask
+        used[i] = 1
+        self._devs[i] = dev
+        self._inos[i] = ino
+        self._size += 1
+
+    def _grow(self) -> None:
+        """Удваивает таблицу и перехеширует занятые слоты."""
+        devs, inos, used = self._devs, self._inos, self._used
+        self._alloc(64 - self._shift + 1)
+        insert = self._insert
+        for i in range(len(used)):
+            if used[i]:
+                insert(devs[i], inos[i])
+
+    def _remove(self, dev: int, ino: int) -> None:
+        """Удаляет присутствующую пару обратным сдвигом цепочки пробирования."""
+        used = self._used
+        devs = self._devs
+        inos = self._inos
+        mask = self._mask
+        shift = self._shift
+        i = (((ino ^ dev) * _FIB_MULT) & _MASK64) >> shift
+        while inos[i] != ino or devs[i] != dev:
+            i = (i + 1) & mask
+
+        # Запись из слота j можно перенести в освободившийся слот i, только
+        # если её домашний слот k не лежит циклически в интервале (i, j]
+        j = i
+        while True:
+            j = (j + 1) & mask
+            if not used[j]:
+                break
+            k = (((inos[j] ^ devs[j]) * _FIB_MULT) & _MASK64) >> shift
+            if (k <= i or k > j) if i <= j else (k <= i and k > j):
+                devs[i] = devs[j]
+                inos[i] = inos[j]
+                i = j
+        used[i] = 0
+        self._size -= 1
+
+
+class WalkStatsView:
+    """
+    Живое представление статистики обхода только для чтения.
+
+    Не копирует счётчики: каждое обращение к атрибуту читает текущее значение.
+    Возвращается ``SafeFileWalker.stats_view()`` и создаётся один раз на обходчик,
+    поэтому частый опрос (например, для индикатора прогресса) не выделяет память.
+    """
+
+    __slots__ = ('_stats', '_clock')
+
+    def __init__(self, stats: _InternalStats, clock: Callable[[], float]):
+        self._stats = stats
+        self._clock = clock
+
+    @property
+    def files_yielded(self) -> int:
+        return self._stats.files_yielded
+
+    @property
+    def files_skipped(self) -> int:
+        return self._stats.files_skipped
+
+    @property
+    def dirs_skipped(self) -> int:
+        return self._stats.dirs_skipped
+
+    @property
+    def bytes_processed(self) -> int:
+        return self._stats.bytes_processed
+
+    @property
+    def time_elapsed(self) -> float:
+        return self._clock() - self._stats.start_time
+
+    def __repr__(self) -> str:
+        return (
+            f"WalkStatsView(files_yielded={self.files_yielded}, "
+            f"files_skipped={self.files_skipped}, "
+            f"dirs_skipped={self.dirs_skipped}, "
+            f"bytes_processed={self.bytes_processed})"
+        )
+
+
 class SafeFileWalker:
     """
     Итератор для безопасного рекурсивного обхода файловой системы.
@@ -119,33 +433,54 @@ class SafeFileWalker:
     __slots__ = (
         'config',
         '_stats',
+        '_stats_view',
         '_seen_inodes',
-        '_inode_fifo'
+        '_rate_bytes',
+        '_burst_bytes',
+        '_tokens',
+        '_last_refill',
+        '_root_abs',
+        '_root_prefix',
+        '_clock',
     )
 
     def __init__(self, config: SafeWalkConfig):
-        if not isinstance(config.root, Path):
-            raise TypeError("config.root must be a pathlib.Path")
-        if not config.root.is_absolute():
-            raise ValueError("Root path must be absolute")
-        _validate_positive(config.max_unique_files, "max_unique_files")
+        # Тип и абсолютность root проверены в SafeWalkConfig.__post_init__
+        if config.max_unique_files < 0:
+            raise ValueError("max_unique_files must be non-negative")
         _validate_positive(config.max_rate_mb_per_sec, "max_rate_mb_per_sec")
         _validate_positive(config.timeout_sec, "timeout_sec")
         
         if config.max_depth is not None and config.max_depth < 0:
             raise ValueError("max_depth must be non-negative or None")
-            
-        start_time = time.monotonic()
+        _validate_positive(config.num_threads, "num_threads")
+        _validate_positive(config.burst_seconds, "burst_seconds")
+        if config.order not in (None, "name", "inode", "raw"):
+            raise ValueError("order must be 'name', 'inode', 'raw' or None")
+
+        # root уже разрешён конфигурацией: ни resolve(), ни is_absolute() здесь
+        # и в обходе не вызываются, граница проверяется строковым префиксом
+        self._root_abs = os.fspath(config.root)
+        self._root_prefix = config._root_str
+
+        self._clock = config.clock
+        start_time = self._clock()
         self._stats = _InternalStats(start_time=start_time)
+        self._stats_view = WalkStatsView(self._stats, self._clock)
         self.config = config
-        # LRU-like кэш через deque + set для дедупликации
-        self._seen_inodes: set[Tuple[int, int]] = set()
-        self._inode_fifo: Deque[Tuple[int, int]] = deque()
+        # LRU-like кэш для дедупликации по (st_dev, st_ino). При
+        # max_unique_files=0 дедупликация отключена и таблица не используется
+        self._seen_inodes = _InodeTable(max(config.max_unique_files, 1))
+        # Token bucket для rate limiting: стартуем с полным запасом
+        self._rate_bytes = config.max_rate_mb_per_sec * 1024 * 1024
+        self._burst_bytes = self._rate_bytes * config.burst_seconds
+        self._tokens = self._burst_bytes
+        self._last_refill = start_time
 
     @property
     def stats(self) -> WalkStats:
         """Возвращает снимок статистики обхода."""
-        current_time = time.monotonic()
+        current_time = self._clock()
         return WalkStats(
             files_yielded=self._stats.files_yielded,
             files_skipped=self._stats.files_skipped,
@@ -154,136 +489,221 @@ class SafeFileWalker:
             time_elapsed=current_time - self._stats.start_time
         )
 
+    def stats_view(self) -> WalkStatsView:
+        """
+        Возвращает живое представление статистики без копирования.
+
+        В отличие от ``stats``, не создаёт новый объект при каждом вызове;
+        значения меняются по ходу обхода. Для неизменяемого снимка используйте ``stats``.
+        """
+        return self._stats_view
+
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         # Очистка ресурсов
         self._seen_inodes.clear()
-        self._inode_fifo.clear()
 
     def __repr__(self) -> str:
         return f"SafeFileWalker(config={self.config!r}, stats={self.stats!r})"
 
-    def _check_timeout(self) -> None:
-        """Проверяет, не превышен ли лимит времени выполнения."""
-        elapsed = time.monotonic() - self._stats.start_time
-        if elapsed > self.config.timeout_sec:
-            raise TimeoutError("File walk exceeded configured time limit")
+    def _check_timeout(self, now: float) -> None:
+        """
+        Проверяет, не превышен ли лимит времени выполнения.
 
-    def _check_depth(self, path: Path, current_depth: int) -> bool:
-        """Проверяет, не превышена ли максимальная глубина."""
-        if self.config.max_depth is None:
-            return True
-        if current_depth > self.config.max_depth:
-            self._skip(path, "max_depth_exceeded", is_dir=True)
-            return False
-        return True
+        Args:
+            now: Текущее значение config.clock(), уже прочитанное вызывающим.
+        """
+        if now - self._stats.start_time > self.config.timeout_sec:
+            raise TimeoutError("File walk exceeded configured time limit")
 
-    def _increment_stat(self, field: str) -> None:
-        """Централизованное обновление статистики."""
-        if field == 'files_yielded':
-            self._stats.files_yielded += 1
-        elif field == 'files_skipped':
-            self._stats.files_skipped += 1
-        elif field == 'dirs_skipped':
-            self._stats.dirs_skipped += 1
-        else:
-            raise ValueError(f"Unknown stat field: {field}")
+    def _make_skip(self) -> _SkipFn:
+        """
+        Создаёт функцию учёта пропусков для одного обхода.
 
-    def _update_bytes_processed(self, size: int) -> None:
-        """Обновляет количество обработанных байт."""
-        self._stats.bytes_processed += size
+        ``on_skip`` читается из конфигурации один раз. Без коллбэка функция
+        только увеличивает счётчик — без обращения к config и без try/except.
+        """
+        stats = self._stats
+        on_skip = self.config.on_skip
 
-    def _skip(self, path: Path, reason: str, is_dir: bool = False) -> None:
-        """Вызывает коллбэк пропуска, если он задан."""
-        if is_dir:
-            self._increment_stat('dirs_skipped')
-        else:
-            self._increment_stat('files_skipped')
+        if on_skip is None:
+            def skip(path: str, reason: str, is_dir: bool) -> None:
+                # Прямая запись в слот _InternalStats, без диспетчеризации по имени поля
+                if is_dir:
+                    stats.dirs_skipped += 1
+                else:
+                    stats.files_skipped += 1
+            return skip
 
-        if self.config.on_skip is not None:
+        def skip_with_callback(path: str, reason: str, is_dir: bool) -> None:
+            if is_dir:
+                stats.dirs_skipped += 1
+            else:
+                stats.files_skipped += 1
             try:
-                self.config.on_skip(path, reason)
+                # Path создаётся только для коллбэка — горячий цикл работает со str
+                on_skip(Path(path), reason)
             except Exception:
                 # Не позволяем коллбэку сломать основной поток
                 pass
+        return skip_with_callback
 
-    def _rate_limit(self, file_size: int) -> None:
+    def _rate_limit(self, file_size: int, now: float) -> None:
         """
-        Применяет ограничение скорости на основе накопленного объёма.
+        Применяет ограничение скорости по схеме token bucket.
+
+        Запас пополняется со скоростью max_rate_mb_per_sec до burst_seconds
+        секунд работы; пауза нужна только когда запас ушёл в минус. Долг за
+        крупный файл гасится несколькими паузами не длиннее _MAX_RATE_SLEEP,
+        между ними проверяется таймаут.
 
         Args:
             file_size: Размер файла в байтах.
+            now: Текущее значение config.clock(), уже прочитанное вызывающим.
         """
         if file_size <= 0:
             return
-        self._update_bytes_processed(file_size)
-        current_elapsed = time.monotonic() - self._stats.start_time
-        target_elapsed = self._stats.bytes_processed / (self.config.max_rate_mb_per_sec * 1024 * 1024)
-        if current_elapsed < target_elapsed:
-            sleep_duration = target_elapsed - current_elapsed
-            if sleep_duration > 0:
-                time.sleep(sleep_duration)
-
-    def _add_inode(self, dev_ino: Tuple[int, int]) -> bool:
+        self._stats.bytes_processed += file_size
+        rate = self._rate_bytes
+        tokens = min(self._burst_bytes, self._tokens + (now - self._last_refill) * rate) - file_size
+        self._last_refill = now
+        if tokens < 0:
+            debt = -tokens / rate
+            while debt > 0:
+                pause = min(debt, _MAX_RATE_SLEEP)
+                time.sleep(pause)
+                debt -= pause
+                now = self._clock()
+                self._check_timeout(now)
+            self._last_refill = now
+            tokens = 0.0
+        self._tokens = tokens
+
+    def _resolve_symlink(self, path: str, real_parents: dict[str, str]) -> str:
         """
-        Добавляет inode в кэш с LRU-логикой.
-        
-        Returns:
-            True если успешно добавлен, False если пропущен (duplicate или full cache).
+        Разрешает symlink в реальный путь (аналог ``os.path.realpath``).
+
+        ``os.path.realpath`` делает lstat (и readlink) для каждого компонента
+        пути. Здесь читается только сама ссылка, а реальный путь каталога
+        цели берётся из ``real_parents`` — кэша, который живёт в пределах
+        одного читаемого каталога, чтобы не расширять окно TOCTOU. Цепочки
+        symlink и цели вида ``.``/``..`` разрешаются полным ``realpath``.
+
+        Args:
+            path: Путь к symlink.
+            real_parents: Кэш {каталог цели: его реальный путь}.
         """
-        if dev_ino in self._seen_inodes:
-            return False  # уже есть
-        if len(self._seen_inodes) >= self.config.max_unique_files:
-            oldest = self._inode_fifo.popleft()
-            self._seen_inodes.discard(oldest)
-        self._seen_inodes.add(dev_ino)
-        self._inode_fifo.append(dev_ino)
-        return True
+        if not _FAST_SYMLINK_RESOLVE:
+            return os.path.realpath(path)
+        target = os.readlink(path)
+        head, tail = os.path.split(os.path.join(os.path.dirname(path), target))
+        if not tail or tail in ('.', '..'):
+            return os.path.realpath(path)
+        real_head = real_parents.get(head)
+        if real_head is None:
+            real_head = real_parents[head] = os.path.realpath(head)
+        resolved = os.path.join(real_head, tail)
+        try:
+            if stat.S_ISLNK(os.lstat(resolved).st_mode):
+                return os.path.realpath(path)  # цепочка symlink
+        except OSError:
+            # Битая ссылка (ENOENT, ENOTDIR, EACCES...) — как realpath(strict=False),
+            # путь возвращается как есть
+            pass
+        return resolved
 
-    def _process_entry(self, entry: os.DirEntry, root_abs: Path, depth: int) -> Optional[Tuple[Path, os.stat_result, bool]]:
+    def _process_entry(
+        self,
+        entry: os.DirEntry,
+        root_prefix: str,
+        depth: int,
+        skip: _SkipFn,
+        need_stat: bool = True,
+        real_parents: Optional[dict[str, str]] = None,
+    ) -> Optional[Tuple[str, Optional[os.stat_result], bool]]:
         """
         Обрабатывает один элемент каталога с атомарным lstat.
-        
+
+        Работает со строковыми путями: ``pathlib.Path`` не создаётся на каждый
+        элемент, граница root проверяется через ``str.startswith``.
+
+        Системные вызовы на элемент:
+            - тип (файл/каталог/symlink) берётся из d_type, полученного
+              getdents64 вместе с именем, — 0 вызовов; DirEntry сам делает
+              lstat, только если ФС вернула DT_UNKNOWN;
+            - lstat выполняется не более одного раза, только для файлов и
+              symlink'ов, прошедших проверки глубины и границы root, и только
+              если размер или (dev, ino) кому-то нужны; результат кэшируется
+              в DirEntry и передаётся дальше, повторно не запрашивается;
+            - на Windows DirEntry.stat(follow_symlinks=False) берётся из данных
+              FindNextFile и не требует вызова вовсе.
+        Пакетного stat в стандартной библиотеке нет; statx/io_uring через ctypes
+        всё равно стоили бы одного вызова на файл, поэтому не используются.
+
         Returns:
-            - (resolved_path: Path, stat_result: os.stat_result, is_dir: bool) для файлов
-            - (resolved_path, stat_result, True) для директорий
+            - (resolved_path: str, stat_result, False) для файлов;
+              stat_result равен None, если need_stat=False
+            - (path, None, True) для директорий (stat не выполняется)
             - None если пропущен
+
+        Пропуски сообщаются через ``skip`` — в многопоточном режиме это
+        не функция из ``_make_skip``, а передача события в поток-потребитель.
         """
-        entry_path = Path(entry.path)
+        entry_path = entry.path
+        max_depth = self.config.max_depth
 
-        # Атомарный stat — предотвращает TOCTOU
+        # Тип элемента берётся из d_type (getdents64) — без отдельного syscall.
+        # Это тот же снимок каталога, что и имя, поэтому TOCTOU не появляется.
         try:
-            stat_result = entry.stat(follow_symlinks=False)  # всегда lstat
-        except (OSError, ValueError) as e:
-            # stat_result не определена при ошибке — предполагаем файл (частый случай)
-            self._skip(entry_path, f"stat_failed: {type(e).__name__}", is_dir=False)
+            is_symlink = entry.is_symlink()
+            is_dir = not is_symlink and entry.is_dir(follow_symlinks=False)
+        except OSError as e:
+            skip(entry_path, f"stat_failed: {type(e).__name__}", False)
             return None
 
-        is_symlink = stat.S_ISLNK(stat_result.st_mode)
-        is_dir = stat.S_ISDIR(stat_result.st_mode)
+        if is_dir:
+            # Для директорий st_size/st_dev/st_ino не нужны — stat не вызываем
+            if max_depth is not None and depth > max_depth:
+                skip(entry_path, SkipReason.MAX_DEPTH_EXCEEDED, True)
+                return None
+            return entry_path, None, True
 
         if is_symlink and not self.config.follow_symlinks:
-            self._skip(entry_path, "symlink_blocked", is_dir=is_dir)
+            skip(entry_path, SkipReason.SYMLINK_BLOCKED, False)
             return None
 
         resolved_path = entry_path
-        if is_symlink and self.config.follow_symlinks:
+        if is_symlink:
             try:
-                resolved_path = entry_path.resolve(strict=False)
-            except OSError:
-                self._skip(entry_path, "broken_symlink", is_dir=is_dir)
+                resolved_path = self._resolve_symlink(entry_path, {} if real_parents is None else real_parents)
+            except (OSError, ValueError):
+                skip(entry_path, SkipReason.BROKEN_SYMLINK, False)
                 return None
 
-        if not resolved_path.is_relative_to(root_abs):
-            self._skip(entry_path, "traversal_via_symlink", is_dir=is_dir)
-            return None
+            # Обычные элементы лежат внутри root по построению (entry.path
+            # собран из уже проверенного каталога), проверять нужно только цель symlink
+            if resolved_path != root_prefix[:-1] and not resolved_path.startswith(root_prefix):
+                skip(entry_path, SkipReason.TRAVERSAL_VIA_SYMLINK, False)
+                return None
 
         # Проверка глубины после разрешения symlink
-        if not self._check_depth(resolved_path, depth):
+        if max_depth is not None and depth > max_depth:
+            skip(resolved_path, SkipReason.MAX_DEPTH_EXCEEDED, True)
             return None
 
+        # lstat нужен только файлам, которые дошли до выдачи: размер — для
+        # rate limiting, (dev, ino) — для дедупликации. Отброшенные выше
+        # элементы (глубина, выход за root) lstat не тратят
+        stat_result = None
+        if need_stat:
+            try:
+                stat_result = entry.stat(follow_symlinks=False)  # всегда lstat
+            except (OSError, ValueError) as e:
+                skip(entry_path, f"stat_failed: {type(e).__name__}", False)
+                return None
+
         return resolved_path, stat_result, is_dir
 
     def __iter__(self) -> Iterator[Path]:
@@ -291,57 +711,497 @@ class SafeFileWalker:
         Возвращает итератор по всем файлам внутри root с учётом всех ограничений.
 
         Yields:
-            Path: Путь к каждому найденному файлу (абсолютный, разрешённый).
+            Path к каждому найденному файлу (абсолютный, разрешённый).
         """
-        try:
-            root_abs = self.config.root.resolve(strict=False)
-        except OSError as e:
-            raise ValueError(f"Cannot resolve root path: {self.config.root}") from e
+        return self._walk(False)
+
+    def iter_str(self) -> Iterator[str]:
+        """
+        Как ``iter(walker)``, но отдаёт пути строками — без создания Path на каждый файл.
+
+        Yields:
+            str к каждому найденному файлу (абсолютный, разрешённый).
+        """
+        return self._walk(False, as_str=True)
+
+    def iter_with_stat(self) -> Iterator[Tuple[Path, os.stat_result]]:
+        """
+        Как ``iter(walker)``, но вместе с путём отдаёт lstat файла.
+
+        Результат stat уже получен обходчиком для дедупликации и rate limiting,
+        поэтому потребителю не нужен повторный ``path.stat()``. Для ссылок,
+        пройденных при follow_symlinks=True, отдаётся stat цели (как у
+        ``path.stat()``) — это один дополнительный вызов на такую ссылку;
+        висячие ссылки в этом режиме пропускаются как ``stat_failed``.
+
+        Yields:
+            (путь, os.stat_result) для каждого найденного файла.
+        """
+        return self._walk(True)
+
+    def iter_fast(self) -> Iterator[Path]:
+        """
+        Обход без опциональных ограничений: rate limiting, дедупликации и таймаута.
+
+        Защита границ root, обработка symlink и max_depth сохраняются. Файлы
+        не проходят lstat, поэтому bytes_processed в статистике не растёт.
+        Подходит для подсчёта и листинга доверенных деревьев.
+        """
+        return self._walk(False, fast=True)
+
+    def iter_fast_str(self) -> Iterator[str]:
+        """Как ``iter_fast()``, но отдаёт пути строками."""
+        return self._walk(False, fast=True, as_str=True)
+
+    def _walk(self, with_stat: bool, fast: bool = False, as_str: bool = False) -> Iterator:
+        """
+        Общий генератор обхода для ``__iter__``, ``iter_str``, ``iter_with_stat``,
+        ``iter_fast`` и ``iter_fast_str``.
+
+        Опциональные слои (rate limiting, дедупликация, таймаут) включаются
+        флагами, вычисленными один раз; lstat файла выполняется, только если
+        его результат кому-то нужен. Каталоги читает ``_iter_sequential`` или
+        ``_iter_parallel`` — оба проверяют элементы одним ``_process_entry``,
+        — а учёт файлов ниже общий для обоих режимов.
+        """
+        config = self.config
+        rate_limited = not fast and config.max_rate_mb_per_sec != _INF
+        dedup = not fast and config.max_unique_files > 0
+        timed = not fast and config.timeout_sec != _INF
+        need_stat = rate_limited or dedup or with_stat
+        check_timeout = self._check_timeout if timed else _no_timeout
+        skip = self._make_skip()
+
+        if config.num_threads > 1:
+            files = self._iter_parallel(skip, check_timeout, need_stat)
+        else:
+            files = self._iter_sequential(skip, timed, need_stat)
+
+        # Атрибуты и методы связываются в локальные переменные один раз:
+        # в цикле по файлам это LOAD_FAST вместо цепочки LOAD_ATTR
+        clock = self._clock
+        stats = self._stats
+        add_inode = self._seen_inodes.add
+        rate_limit = self._rate_limit
+
+        for path, stat_result in files:
+            if stat_result is not None:
+                # Файл: проверяем дедупликацию по (dev, ino)
+                if dedup and not add_inode(stat_result.st_dev, stat_result.st_ino):
+                    skip(path, SkipReason.HARDLINK_DUPLICATE, False)
+                    continue
+
+                if rate_limited:
+                    # Одно чтение часов на файл — и для bucket, и для таймаута
+                    now = clock()
+                    check_timeout(now)
+                    rate_limit(stat_result.st_size, now)
+                elif stat_result.st_size > 0:
+                    stats.bytes_processed += stat_result.st_size
+
+                # lstat ссылки описывает саму ссылку — потребителю нужна цель
+                if with_stat and stat.S_ISLNK(stat_result.st_mode):
+                    try:
+                        stat_result = os.stat(path)
+                    except OSError as e:
+                        skip(path, f"stat_failed: {type(e).__name__}", False)
+                        continue
+
+            stats.files_yielded += 1
+            # Path создаётся только на границе API
+            out = path if as_str else Path(path)
+            if with_stat:
+                yield out, stat_result
+            else:
+                yield out
+
+    def _iter_sequential(
+        self, skip: _SkipFn, timed: bool, need_stat: bool
+    ) -> Iterator[Tuple[str, Optional[os.stat_result]]]:
+        """
+        Однопоточное чтение каталогов: отдаёт (путь, lstat или None) для файлов.
+
+        Пропуски сообщаются через ``skip`` сразу; каждый элемент проверяется
+        ``_process_entry`` — тем же кодом, что и в многопоточном режиме.
+        """
+        sort_key = _entry_sort_key(self.config)
+        max_depth = self.config.max_depth
+        timeout = self.config.timeout_sec
+        timeout_mask = 0 if timeout < _SHORT_TIMEOUT_SEC else _TIMEOUT_CHECK_MASK
+        start = self._stats.start_time
+        clock = self._clock
+        process_entry = self._process_entry
+        root_prefix = self._root_prefix
+        entry_count = 0
 
         # Используем стек для DFS вместо рекурсии — избегаем глубоких вызовов
-        # Элемент стека: (Path, depth)
-        stack: list[Tuple[Path, int]] = [(root_abs, 0)]
+        # Элемент стека: (str, depth). deque, как и у _ParallelScanner:
+        # extend(reversed(...)) не копирует список подкаталогов
+        stack: Deque[Tuple[str, int]] = deque([(self._root_abs, 0)])
 
         while stack:
             current_dir, depth = stack.pop()
-            self._check_timeout()
+            if timed and clock() - start > timeout:
+                raise TimeoutError("File walk exceeded configured time limit")
 
             # Проверка глубины для директории
-            if not self._check_depth(current_dir, depth):
+            if max_depth is not None and depth > max_depth:
+                skip(current_dir, SkipReason.MAX_DEPTH_EXCEEDED, True)
                 continue
 
+            child_depth = depth + 1
+            real_parents: dict[str, str] = {}
+            # Без сортировки порядок не важен — подкаталоги кладутся прямо в стек
+            subdirs: list[Tuple[str, int]] = []
+            push_dir = subdirs.append if sort_key is not None else stack.append
+
             try:
                 with os.scandir(current_dir) as scan_iter:
-                    if self.config.deterministic:
-                        entries = sorted(scan_iter, key=lambda e: e.name)
+                    for entry in _listing(scan_iter, sort_key):
+                        # Таймаут проверяется на каждом каталоге и раз в 1024 элемента
+                        # (при лимите меньше _SHORT_TIMEOUT_SEC — на каждом элементе)
+                        entry_count += 1
+                        if timed and not entry_count & timeout_mask and clock() - start > timeout:
+                            raise TimeoutError("File walk exceeded configured time limit")
+
+                        result = process_entry(entry, root_prefix, child_depth, skip, need_stat, real_parents)
+                        if result is None:
+                            continue
+                        path, stat_result, is_dir = result
+                        if is_dir:
+                            push_dir((path, child_depth))
+                        else:
+                            yield path, stat_result
+            except TimeoutError:
+                # TimeoutError — подкласс OSError: не превращаем его в пропуск каталога
+                raise
+            except OSError as e:
+                skip(current_dir, f"scan_failed: {type(e).__name__}", True)
+
+            # Добавляем подкаталоги в обратном порядке для сохранения порядка (как в os.walk)
+            if subdirs:
+                stack.extend(reversed(subdirs))
+
+    def _iter_parallel(
+        self, skip: _SkipFn, check_timeout: Callable[[float], None], need_stat: bool
+    ) -> Iterator[Tuple[str, Optional[os.stat_result]]]:
+        """
+        Многопоточное чтение каталогов: пул потоков читает каталоги, текущий
+        поток отдаёт (путь, lstat или None) для файлов.
+
+        Пропуски из пачек передаются в ``skip`` здесь, в потоке-потребителе,
+        как и дедупликация, rate limiting и статистика в ``_walk`` — поэтому
+        блокировки для них не нужны.
+        """
+        clock = self._clock
+        # С сортировкой обход обязан повторить однопоточный порядок — пул только
+        # читает каталоги наперёд; без неё потоки свободно крадут работу
+        sort_key = _entry_sort_key(self.config)
+        scanner: Union[_OrderedScanner, _ParallelScanner]
+        if sort_key is not None:
+            scanner = _OrderedScanner(self, self._root_abs, self._root_prefix, check_timeout, need_stat, sort_key)
+        else:
+            scanner = _ParallelScanner(self, self._root_abs, self._root_prefix, check_timeout, need_stat)
+        with scanner:
+            for batch in scanner:
+                check_timeout(clock())
+                for path, stat_result, reason, is_dir in batch:
+                    if reason is not None:
+                        skip(path, reason, is_dir)
                     else:
-                        entries = scan_iter  # ленивый генератор
-            except (OSError, PermissionError) as e:
-                self._skip(current_dir, f"scan_failed: {type(e).__name__}", is_dir=True)
-                continue
+                        yield path, stat_result
 
-            subdirs: list[Tuple[Path, int]] = []
 
-            for entry in entries:
-                self._check_timeout()
-                result = self._process_entry(entry, root_abs, depth + 1)
-                if result is None:
-                    continue
+def _listing(
+    scan_iter: Iterator[os.DirEntry], sort_key: Optional[Callable[[os.DirEntry], Any]]
+) -> Iterable[os.DirEntry]:
+    """
+    Элементы каталога в порядке обхода.
+
+    С сортировкой каталог читается целиком и дескриптор закрывается сразу,
+    а не держится, пока потребитель обрабатывает файлы (повторный close()
+    в ``__exit__`` ничего не делает). Без сортировки — ленивый поток без
+    списка на весь каталог.
+    """
+    if sort_key is None:
+        return scan_iter
+    listing = list(scan_iter)
+    scan_iter.close()  # type: ignore[attr-defined]
+    listing.sort(key=sort_key)
+    return listing
+
+
+def _entry_sort_key(config: SafeWalkConfig) -> Optional[Callable[[os.DirEntry], Any]]:
+    """Ключ сортировки элементов каталога по ``config.order``; None — без сортировки."""
+    order = config.order
+    if order is None:
+        order = "name" if config.deterministic else "raw"
+    if order == "name":
+        return _BY_NAME
+    if order == "inode":
+        return _BY_INODE
+    return None
+
 
-                resolved_path, stat_result, is_dir = result
+def _no_timeout(now: float) -> None:
+    """Заглушка проверки таймаута для обхода без ограничения по времени."""
 
+
+def _scan_dir(
+    walker: "SafeFileWalker",
+    current_dir: str,
+    depth: int,
+    root_prefix: str,
+    need_stat: bool,
+    sort_key: Optional[Callable[[os.DirEntry], Any]],
+) -> Tuple[list[_WalkEvent], list[str]]:
+    """
+    Читает один каталог в потоке пула.
+
+    Returns:
+        (события по файлам и пропускам в порядке элементов, пути подкаталогов).
+        Подкаталоги имеют глубину depth + 1.
+    """
+    batch: list[_WalkEvent] = []
+    subdirs: list[str] = []
+
+    def skip(path: str, reason: str, is_dir: bool) -> None:
+        batch.append((path, None, reason, is_dir))
+
+    real_parents: dict[str, str] = {}
+    try:
+        with os.scandir(current_dir) as scan_iter:
+            for entry in _listing(scan_iter, sort_key):
+                result = walker._process_entry(entry, root_prefix, depth + 1, skip, need_stat, real_parents)
+                if result is None:
+                    continue
+                path, stat_result, is_dir = result
                 if is_dir:
-                    subdirs.append((resolved_path, depth + 1))
+                    subdirs.append(path)
                 else:
-                    # Файл: проверяем дедупликацию по (dev, ino)
-                    inode_key = (stat_result.st_dev, stat_result.st_ino)
-                    if not self._add_inode(inode_key):
-                        self._skip(resolved_path, "hardlink_duplicate_or_cache_full", is_dir=False)
-                        continue
+                    batch.append((path, stat_result, None, False))
+    except OSError as e:
+        skip(current_dir, f"scan_failed: {type(e).__name__}", True)
+    return batch, subdirs
 
-                    self._rate_limit(stat_result.st_size)
-                    self._increment_stat('files_yielded')
-                    yield resolved_path
 
-            # Добавляем подкаталоги в обратном порядке для сохранения порядка (как в os.walk)
-            stack.extend(reversed(subdirs))
\ No newline at end of file
+class _OrderedScanner:
+    """
+    Упреждающее чтение каталогов для упорядоченного обхода (num_threads > 1).
+
+    Поток-потребитель идёт по тому же стеку DFS, что и однопоточный обход,
+    поэтому порядок файлов и пропусков совпадает с ним. Пул заранее читает
+    каталоги с вершины стека — именно они понадобятся следующими. Число
+    запущенных, но ещё не отданных каталогов не превышает num_threads * 4:
+    соседи, ушедшие вглубь стека после раскрытия подкаталогов, занимают
+    окно, пока до них не дойдёт очередь, поэтому память под прочитанные
+    результаты не растёт с глубиной дерева.
+    """
+
+    __slots__ = (
+        '_walker',
+        '_root_abs',
+        '_root_prefix',
+        '_check_timeout',
+        '_need_stat',
+        '_sort_key',
+        '_window',
+        '_executor',
+    )
+
+    def __init__(
+        self,
+        walker: "SafeFileWalker",
+        root_abs: str,
+        root_prefix: str,
+        check_timeout: Callable[[float], None],
+        need_stat: bool,
+        sort_key: Callable[[os.DirEntry], Any],
+    ):
+        self._walker = walker
+        self._root_abs = root_abs
+        self._root_prefix = root_prefix
+        self._check_timeout = check_timeout
+        self._need_stat = need_stat
+        self._sort_key = sort_key
+        num_threads = walker.config.num_threads
+        self._window = num_threads * 4
+        self._executor = ThreadPoolExecutor(max_workers=num_threads, thread_name_prefix="safe_file_walker")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        # Непрочитанные каталоги из окна упреждения больше не нужны
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _submit(self, path: str, depth: int) -> "Future[Tuple[list[_WalkEvent], list[str]]]":
+        return self._executor.submit(
+            _scan_dir, self._walker, path, depth, self._root_prefix, self._need_stat, self._sort_key
+        )
+
+    def __iter__(self) -> Iterator[list[_WalkEvent]]:
+        """Отдаёт пачки событий по каталогам в порядке однопоточного обхода."""
+        clock = self._walker._clock
+        window = self._window
+        stack: list[Tuple[str, int]] = [(self._root_abs, 0)]
+        # Каталог в обходе встречается один раз (symlink на каталог не
+        # раскрывается), поэтому путь однозначно задаёт задачу
+        prefetched: dict[str, Future[Tuple[list[_WalkEvent], list[str]]]] = {}
+
+        while stack:
+            # Вершина стека — первой: при заполненном окне упреждается то,
+            # что понадобится раньше
+            if len(prefetched) < window:
+                for path, depth in reversed(stack[-window:]):
+                    if path not in prefetched:
+                        prefetched[path] = self._submit(path, depth)
+                        if len(prefetched) >= window:
+                            break
+
+            current_dir, depth = stack.pop()
+            future = prefetched.pop(current_dir, None)
+            if future is None:
+                # Окно занято отложенными соседями — текущий каталог читается без упреждения
+                future = self._submit(current_dir, depth)
+            while True:
+                try:
+                    batch, subdirs = future.result(timeout=0.1)
+                    break
+                except FutureTimeoutError:
+                    pass
+                self._check_timeout(clock())
+
+            # Обратный порядок: первым со стека снимется первый подкаталог
+            child_depth = depth + 1
+            stack.extend((path, child_depth) for path in reversed(subdirs))
+            if batch:
+                yield batch
+
+
+class _ParallelScanner:
+    """
+    Пул потоков, читающий каталоги для ``SafeFileWalker`` (num_threads > 1).
+
+    Каждый поток ведёт свой deque каталогов (LIFO для себя) и при простое
+    забирает работу у случайного соседа с противоположного конца (work
+    stealing). Результаты по каждому каталогу передаются пачкой через
+    ограниченную очередь; пустая пачка означает конец обхода.
+    """
+
+    __slots__ = (
+        '_walker',
+        '_root_prefix',
+        '_num_threads',
+        '_deques',
+        '_results',
+        '_cond',
+        '_stop',
+        '_pending',
+        '_executor',
+        '_futures',
+        '_check_timeout',
+        '_need_stat',
+    )
+
+    def __init__(
+        self,
+        walker: "SafeFileWalker",
+        root_abs: str,
+        root_prefix: str,
+        check_timeout: Callable[[float], None],
+        need_stat: bool,
+    ):
+        self._walker = walker
+        self._check_timeout = check_timeout
+        self._need_stat = need_stat
+        self._root_prefix = root_prefix
+        self._num_threads = walker.config.num_threads
+        self._deques: list[Deque[Tuple[str, int]]] = [deque() for _ in range(self._num_threads)]
+        self._deques[0].append((root_abs, 0))
+        self._results: "queue.Queue[list[_WalkEvent]]" = queue.Queue(maxsize=self._num_threads * 4)
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._pending = 1  # каталоги в очередях или в обработке; под _cond
+        self._executor = ThreadPoolExecutor(max_workers=self._num_threads, thread_name_prefix="safe_file_walker")
+        self._futures = [self._executor.submit(self._worker, i) for i in range(self._num_threads)]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        self._executor.shutdown(wait=True)
+
+    def __iter__(self) -> Iterator[list[_WalkEvent]]:
+        """Отдаёт пачки событий, пока обход не завершится."""
+        while True:
+            try:
+                batch = self._results.get(timeout=0.1)
+            except queue.Empty:
+                self._check_timeout(self._walker._clock())
+                # Упавший поток не уменьшит счётчик — пробрасываем его исключение
+                for f in self._futures:
+                    if f.done() and f.exception() is not None:
+                        f.result()
+                continue
+            if not batch:
+                return
+            yield batch
+
+    def _emit(self, batch: list[_WalkEvent]) -> None:
+        while not self._stop.is_set():
+            try:
+                self._results.put(batch, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _take(self, idx: int, rng: random.Random) -> Optional[Tuple[str, int]]:
+        try:
+            return self._deques[idx].pop()
+        except IndexError:
+            pass
+        for peer in rng.sample(range(self._num_threads), self._num_threads):
+            if peer == idx:
+                continue
+            try:
+                return self._deques[peer].popleft()
+            except IndexError:
+                continue
+        return None
+
+    def _worker(self, idx: int) -> None:
+        rng = random.Random(idx)
+        while not self._stop.is_set():
+            item = self._take(idx, rng)
+            if item is None:
+                with self._cond:
+                    if self._pending == 0:
+                        return
+                    self._cond.wait(0.05)
+                continue
+
+            new_dirs = self._scan(idx, *item)
+            with self._cond:
+                self._pending -= 1
+                done = self._pending == 0
+                if new_dirs or done:
+                    self._cond.notify_all()
+            if done:
+                self._emit([])
+
+    def _scan(self, idx: int, current_dir: str, depth: int) -> int:
+        """Читает один каталог; возвращает число найденных подкаталогов."""
+        # Используется только для order="raw" — каталог не сортируется
+        batch, subdirs = _scan_dir(self._walker, current_dir, depth, self._root_prefix, self._need_stat, None)
+        if subdirs:
+            with self._cond:
+                self._pending += len(subdirs)
+            child_depth = depth + 1
+            self._deques[idx].extend((path, child_depth) for path in subdirs)
+        if batch:
+            self._emit(batch)
+        return len(subdirs)
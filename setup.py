@@ -1,5 +1,20 @@
+import os
+import warnings
+
 from setuptools import setup
 
+# Опциональная AOT-компиляция модуля через mypyc (SAFE_FILE_WALKER_MYPYC=1).
+# Собранное расширение импортируется вместо safe_file_walker.py; без флага
+# (или без mypy) ставится чистый Python с тем же API.
+ext_modules = []
+if os.environ.get("SAFE_FILE_WALKER_MYPYC") == "1":
+    try:
+        from mypyc.build import mypycify
+    except ImportError:
+        warnings.warn("SAFE_FILE_WALKER_MYPYC=1, but mypy is not installed; building pure Python")
+    else:
+        ext_modules = mypycify(["safe_file_walker.py"])
+
 setup(
     name="safe-file-walker",
     version="1.0.0",
@@ -8,6 +23,7 @@ setup(
     author_email="your@email.com",  # ← замените на ваш email
     url="https://github.com/saiconfirst/safe-file-walker",
     py_modules=["safe_file_walker"],
+    ext_modules=ext_modules,
     python_requires=">=3.10",
     classifiers=[
         "Development Status :: 5 - Production/Stable",
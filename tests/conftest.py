@@ -0,0 +1,41 @@
+"""
+Shared fixtures for safe_file_walker tests.
+"""
+import os
+import pytest
+
+
+class FakeScandir:
+    """Stand-in for the iterator returned by os.scandir()."""
+
+    def __init__(self, entries):
+        self._entries = iter(entries)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __iter__(self):
+        return self._entries
+
+    def close(self):
+        self._entries = iter(())
+
+
+@pytest.fixture
+def fake_fs(monkeypatch):
+    """
+    Replace os.scandir with a plain function over an in-memory tree.
+
+    Populate the returned dict as ``{directory_path_str: [MockDirEntry, ...]}``;
+    unknown directories list as empty.
+    """
+    fs = {}
+
+    def scandir(path):
+        return FakeScandir(fs.get(os.fspath(path), []))
+
+    monkeypatch.setattr(os, "scandir", scandir)
+    return fs
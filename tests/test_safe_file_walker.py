@@ -1,7 +1,9 @@
 """
 Tests for safe_file_walker module with mocks.
 """
+import itertools
 import os
+import stat
 import sys
 import time
 from pathlib import Path
@@ -10,7 +12,8 @@ import pytest
 
 # Add parent directory to sys.path
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
-from safe_file_walker import SafeFileWalker, SafeWalkConfig, WalkStats
+import safe_file_walker
+from safe_file_walker import SafeFileWalker, SafeWalkConfig, SkipReason, WalkStats, WalkStatsView
 
 
 class TestSafeWalkConfig:
@@ -26,6 +29,7 @@ class TestSafeWalkConfig:
         assert config.max_unique_files == 1_000_000
         assert config.deterministic is True
         assert config.on_skip is None
+        assert config.burst_seconds == 1.0
     
     def test_config_validation(self):
         with pytest.raises(ValueError):
@@ -38,19 +42,27 @@ class TestSafeWalkConfig:
         assert config.max_rate_mb_per_sec == 0.5
 
 
+def make_stat(st_mode=0o100644, st_ino=12345, st_dev=1, st_size=1024):
+    """Build a real os.stat_result (the compiled module rejects mock stat objects)."""
+    return os.stat_result((st_mode, st_ino, st_dev, 1, 0, 0, st_size, 0, 0, 0))
+
+
 class MockDirEntry:
     """Mock os.DirEntry for testing."""
+
+    # Distinct default inodes, so unrelated entries are not hardlink duplicates
+    _inodes = itertools.count(12345)
     
     def __init__(self, name, path, is_file=True, is_dir=False, is_symlink=False,
-                 stat_result=None, inode=12345, device_id=1):
+                 stat_result=None, inode=None, device_id=1):
         self.name = name
         self.path = path
         self._is_file = is_file
         self._is_dir = is_dir
         self._is_symlink = is_symlink
-        self._stat_result = stat_result or MagicMock(
+        self._stat_result = stat_result or make_stat(
             st_mode=0o100644 if is_file else 0o040755,
-            st_ino=inode,
+            st_ino=next(self._inodes) if inode is None else inode,
             st_dev=device_id,
             st_size=1024 if is_file else 4096,
         )
@@ -67,12 +79,14 @@ class MockDirEntry:
     def stat(self, follow_symlinks=True):
         return self._stat_result
 
+    def inode(self):
+        return self._stat_result.st_ino
+
 
 class TestSafeFileWalker:
     """Test the main walker logic."""
     
-    @patch('os.scandir')
-    def test_basic_walk(self, mock_scandir):
+    def test_basic_walk(self, fake_fs):
         """Test walking a simple directory structure."""
         root = Path("/test").resolve()
         
@@ -87,7 +101,8 @@ class TestSafeFileWalker:
             MockDirEntry("file3.txt", str(root / "subdir" / "file3.txt"), is_file=True, is_dir=False),
         ]
         
-        mock_scandir.side_effect = [entries, subdir_entries]
+        fake_fs[str(root)] = entries
+        fake_fs[str(root / "subdir")] = subdir_entries
         
         config = SafeWalkConfig(root=root, max_depth=2)
         walker = SafeFileWalker(config)
@@ -105,8 +120,7 @@ class TestSafeFileWalker:
         assert stats.files_skipped == 0
         assert stats.dirs_skipped == 0
     
-    @patch('os.scandir')
-    def test_hardlink_deduplication(self, mock_scandir):
+    def test_hardlink_deduplication(self, fake_fs):
         """Test that hardlinks are not processed twice."""
         root = Path("/test").resolve()
         
@@ -120,7 +134,7 @@ class TestSafeFileWalker:
                         is_file=True, is_dir=False, inode=1002),  # Different inode
         ]
         
-        mock_scandir.return_value = entries
+        fake_fs[str(root)] = entries
         
         config = SafeWalkConfig(root=root, max_unique_files=1000)
         walker = SafeFileWalker(config)
@@ -133,37 +147,54 @@ class TestSafeFileWalker:
         assert walker.stats.files_yielded == 2
         assert walker.stats.files_skipped == 1
     
-    @patch('os.scandir')
-    @patch('time.time')
-    def test_rate_limiting(self, mock_time, mock_scandir):
+    def test_hardlink_deduplication_wide_keys(self, fake_fs):
+        """Test dedup of st_ino >= 2**64 (ReFS) and negative st_dev without overflow."""
+        root = Path("/test").resolve()
+        wide_ino = 2**64 + 5
+
+        fake_fs[str(root)] = [
+            MockDirEntry("a.txt", str(root / "a.txt"), inode=wide_ino),
+            MockDirEntry("b.txt", str(root / "b.txt"), inode=wide_ino),  # Hardlink of a.txt
+            MockDirEntry("c.txt", str(root / "c.txt"), inode=5),  # Same low 64 bits, other file
+            MockDirEntry("d.txt", str(root / "d.txt"), inode=7, device_id=-1),
+            MockDirEntry("e.txt", str(root / "e.txt"), inode=7, device_id=-1),  # Hardlink of d.txt
+        ]
+
+        skipped = []
+        config = SafeWalkConfig(root=root, on_skip=lambda path, reason: skipped.append(path.name))
+        with SafeFileWalker(config) as w:
+            files = [p.name for p in w]
+
+        assert files == ["a.txt", "c.txt", "d.txt"]
+        assert skipped == ["b.txt", "e.txt"]
+
+    @patch('time.sleep')
+    def test_rate_limiting(self, mock_sleep, fake_fs):
         """Test I/O rate limiting."""
         root = Path("/test").resolve()
         
         # Create a large file (5 MB)
         entries = [
             MockDirEntry("large.bin", str(root / "large.bin"), is_file=True, is_dir=False,
-                        stat_result=MagicMock(st_size=5 * 1024 * 1024)),  # 5 MB
+                        stat_result=make_stat(st_size=5 * 1024 * 1024)),  # 5 MB
         ]
         
-        mock_scandir.return_value = entries
+        fake_fs[str(root)] = entries
         
-        # Mock time to simulate rate limiting
-        time_values = [0.0, 0.01, 0.5]  # Start, after stat, after sleep
-        mock_time.side_effect = time_values
-        
-        config = SafeWalkConfig(root=root, max_rate_mb_per_sec=1.0)  # 1 MB/s
+        # Frozen clock: no time passes, so all debt must be slept off
+        config = SafeWalkConfig(root=root, max_rate_mb_per_sec=1.0, clock=lambda: 0.0)  # 1 MB/s
         walker = SafeFileWalker(config)
         
         with walker as w:
             files = list(w)
         
-        # Should have slept because 5 MB at 1 MB/s = 5 seconds
-        # We can't easily test the sleep call, but we can verify it ran
+        # The bucket starts full (1 s of budget = 1 MB), so 5 MB at 1 MB/s
+        # leaves 4 seconds of debt to sleep off
         assert len(files) == 1
         assert walker.stats.bytes_processed == 5 * 1024 * 1024
+        assert sum(c.args[0] for c in mock_sleep.call_args_list) == pytest.approx(4.0)
     
-    @patch('os.scandir')
-    def test_symlink_handling(self, mock_scandir):
+    def test_symlink_handling(self, fake_fs):
         """Test symlink behavior."""
         root = Path("/test").resolve()
         
@@ -174,7 +205,7 @@ class TestSafeFileWalker:
                         is_file=True, is_dir=False, is_symlink=True),
         ]
         
-        mock_scandir.return_value = entries
+        fake_fs[str(root)] = entries
         
         # With follow_symlinks=False (default)
         config = SafeWalkConfig(root=root, follow_symlinks=False)
@@ -188,9 +219,7 @@ class TestSafeFileWalker:
         assert files[0] == root / "normal.txt"
         assert walker.stats.files_skipped == 1
     
-    @patch('os.scandir')
-    @patch('time.time')
-    def test_timeout(self, mock_time, mock_scandir):
+    def test_timeout(self, fake_fs):
         """Test timeout protection."""
         root = Path("/test").resolve()
         
@@ -199,23 +228,52 @@ class TestSafeFileWalker:
             MockDirEntry("file2.txt", str(root / "file2.txt"), is_file=True, is_dir=False),
         ]
         
-        mock_scandir.return_value = entries
-        
-        # Simulate time passing beyond timeout
-        mock_time.side_effect = [0.0, 10.0, 20.0]  # Start, after first file, after second
+        fake_fs[str(root)] = entries
         
-        config = SafeWalkConfig(root=root, timeout_sec=15.0)
+        # Injected clock: the test moves time forward between files
+        now = [0.0]
+        config = SafeWalkConfig(root=root, timeout_sec=15.0, clock=lambda: now[0])
         walker = SafeFileWalker(config)
         
-        with pytest.raises(TimeoutError):
-            with walker as w:
-                files = list(w)  # Should timeout on second file
+        with walker as w:
+            files = iter(w)
+            assert next(files) == root / "file1.txt"
+            now[0] = 20.0
+            with pytest.raises(TimeoutError):
+                next(files)  # Should timeout on second file
         
         stats = walker.stats
         assert stats.files_yielded == 1  # Only first file before timeout
     
-    @patch('os.scandir')
-    def test_on_skip_callback(self, mock_scandir):
+    def test_timeout_during_scan_reaches_caller(self, fake_fs):
+        """Test that a timeout raised while a directory is scanned is not a scan_failed skip."""
+        root = Path("/test").resolve()
+        sub = root / "subdir"
+        now = [0.0]
+
+        first = MockDirEntry("a.txt", str(sub / "a.txt"))
+        first_stat = first.stat
+
+        def stat_and_tick(follow_symlinks=True):
+            now[0] = 20.0  # The limit runs out while subdir is still being read
+            return first_stat(follow_symlinks)
+
+        first.stat = stat_and_tick
+        fake_fs[str(root)] = [MockDirEntry("subdir", str(sub), is_file=False, is_dir=True)]
+        fake_fs[str(sub)] = [first, MockDirEntry("b.txt", str(sub / "b.txt"))]
+
+        skipped = []
+        config = SafeWalkConfig(root=root, max_rate_mb_per_sec=float("inf"), timeout_sec=15.0,
+                                clock=lambda: now[0], on_skip=lambda path, reason: skipped.append(reason))
+        walker = SafeFileWalker(config)
+        with pytest.raises(TimeoutError):
+            list(walker)
+
+        assert skipped == []
+        assert walker.stats.dirs_skipped == 0
+        assert walker.stats.files_yielded == 1
+
+    def test_on_skip_callback(self, fake_fs):
         """Test skip callback functionality."""
         root = Path("/test").resolve()
         
@@ -225,7 +283,7 @@ class TestSafeFileWalker:
                         is_file=False, is_dir=False, is_symlink=True),
         ]
         
-        mock_scandir.return_value = entries
+        fake_fs[str(root)] = entries
         
         skipped_items = []
         def on_skip(path, reason):
@@ -242,8 +300,7 @@ class TestSafeFileWalker:
         assert skipped_items[0][0] == root / "broken.link"
         assert "symlink" in skipped_items[0][1].lower()
     
-    @patch('os.scandir')
-    def test_deterministic_ordering(self, mock_scandir):
+    def test_deterministic_ordering(self, fake_fs):
         """Test deterministic vs non-deterministic ordering."""
         root = Path("/test").resolve()
         
@@ -254,7 +311,7 @@ class TestSafeFileWalker:
             MockDirEntry("m_file.txt", str(root / "m_file.txt"), is_file=True, is_dir=False),
         ]
         
-        mock_scandir.return_value = entries
+        fake_fs[str(root)] = entries
         
         # Test deterministic=True (default)
         config = SafeWalkConfig(root=root, deterministic=True)
@@ -269,7 +326,6 @@ class TestSafeFileWalker:
         assert files_det[2].name == "z_file.txt"
         
         # Test deterministic=False
-        mock_scandir.return_value = entries  # Reset
         config = SafeWalkConfig(root=root, deterministic=False)
         walker = SafeFileWalker(config)
         
@@ -281,6 +337,322 @@ class TestSafeFileWalker:
         assert files_nondet[1].name == "a_file.txt"
         assert files_nondet[2].name == "m_file.txt"
 
+    def test_blocked_symlink_not_stated(self, fake_fs):
+        """Test that follow_symlinks=False rejects links from d_type alone."""
+        root = Path("/test").resolve()
+
+        link_entry = MockDirEntry("link.txt", str(root / "link.txt"), is_file=True, is_dir=False,
+                                  is_symlink=True)
+        link_entry.stat = MagicMock(wraps=link_entry.stat)
+        link_entry.is_dir = MagicMock(wraps=link_entry.is_dir)
+
+        fake_fs[str(root)] = [link_entry]
+
+        skipped = []
+        config = SafeWalkConfig(root=root, on_skip=lambda path, reason: skipped.append(reason))
+        with SafeFileWalker(config) as w:
+            assert list(w) == []
+
+        assert skipped == [SkipReason.SYMLINK_BLOCKED]
+        link_entry.stat.assert_not_called()
+        link_entry.is_dir.assert_not_called()
+
+    def test_inode_order(self, tmp_path):
+        """Test that order="inode" yields directory entries by inode number."""
+        root = tmp_path.resolve()
+        for name in ("z.txt", "a.txt", "m.txt"):
+            (root / name).write_bytes(b"x")
+
+        config = SafeWalkConfig(root=root, order="inode")
+        with SafeFileWalker(config) as w:
+            files = list(w.iter_str())
+
+        by_inode = sorted(os.scandir(root), key=lambda e: e.inode())
+        assert files == [e.path for e in by_inode]
+
+    def test_inode_order_tolerates_entry_errors(self, fake_fs, monkeypatch):
+        """Test that an inode() error (Windows) does not fail the whole directory."""
+        monkeypatch.setattr(safe_file_walker, "_BY_INODE", safe_file_walker._inode_or_zero)
+        root = Path("/test").resolve()
+
+        vanished = MockDirEntry("vanished.txt", str(root / "vanished.txt"), inode=1)
+        vanished.inode = MagicMock(side_effect=FileNotFoundError)
+        fake_fs[str(root)] = [
+            MockDirEntry("b.txt", str(root / "b.txt"), inode=30),
+            vanished,
+            MockDirEntry("a.txt", str(root / "a.txt"), inode=20),
+        ]
+
+        skipped = []
+        config = SafeWalkConfig(root=root, order="inode", on_skip=lambda path, reason: skipped.append(reason))
+        with SafeFileWalker(config) as w:
+            files = [p.name for p in w]
+
+        assert files == ["vanished.txt", "a.txt", "b.txt"]
+        assert skipped == []
+
+    def test_stat_called_once_per_file(self, fake_fs):
+        """Test that files are lstat'ed once and directories not at all."""
+        root = Path("/test").resolve()
+
+        file_entry = MockDirEntry("file.txt", str(root / "file.txt"), is_file=True, is_dir=False)
+        dir_entry = MockDirEntry("subdir", str(root / "subdir"), is_file=False, is_dir=True)
+        file_entry.stat = MagicMock(wraps=file_entry.stat)
+        dir_entry.stat = MagicMock(wraps=dir_entry.stat)
+
+        fake_fs[str(root)] = [file_entry, dir_entry]
+
+        walker = SafeFileWalker(SafeWalkConfig(root=root))
+        with walker as w:
+            files = list(w)
+
+        assert files == [root / "file.txt"]
+        file_entry.stat.assert_called_once_with(follow_symlinks=False)
+        dir_entry.stat.assert_not_called()
+
+    def test_no_stat_for_rejected_entries(self, fake_fs):
+        """Test that entries skipped by depth or symlink checks are never lstat'ed."""
+        root = Path("/test").resolve()
+
+        file_entry = MockDirEntry("file.txt", str(root / "file.txt"), is_file=True, is_dir=False)
+        link_entry = MockDirEntry("link.txt", str(root / "link.txt"), is_file=True, is_dir=False,
+                                  is_symlink=True)
+        file_entry.stat = MagicMock(wraps=file_entry.stat)
+        link_entry.stat = MagicMock(wraps=link_entry.stat)
+
+        fake_fs[str(root)] = [file_entry, link_entry]
+
+        # Root entries sit at depth 1, so max_depth=0 rejects the file
+        walker = SafeFileWalker(SafeWalkConfig(root=root, max_depth=0))
+        with walker as w:
+            assert list(w) == []
+
+        file_entry.stat.assert_not_called()
+        link_entry.stat.assert_not_called()
+
+    def test_parallel_walk(self, tmp_path):
+        """Test that num_threads > 1 yields the same files as a sequential walk."""
+        root = tmp_path.resolve()
+        for i in range(5):
+            subdir = root / f"dir{i}" / "nested"
+            subdir.mkdir(parents=True)
+            for j in range(10):
+                (subdir / f"file{j}.txt").write_bytes(b"x")
+        (root / "top.txt").write_bytes(b"x")
+
+        with SafeFileWalker(SafeWalkConfig(root=root)) as w:
+            sequential = list(w)
+
+        config = SafeWalkConfig(root=root, num_threads=4)
+        walker = SafeFileWalker(config)
+        with walker as w:
+            parallel = list(w)
+
+        # Sorted order: the pool only prefetches, so the order is identical
+        assert len(parallel) == 51
+        assert parallel == sequential
+        assert walker.stats.files_yielded == 51
+
+        # Raw order: work stealing, same files in any order
+        config = SafeWalkConfig(root=root, num_threads=4, order="raw")
+        with SafeFileWalker(config) as w:
+            unordered = list(w)
+        assert sorted(unordered) == sorted(sequential)
+
+    def test_ordered_prefetch_is_bounded(self, tmp_path, monkeypatch):
+        """Test that unconsumed prefetched directories never exceed num_threads * 4."""
+        root = tmp_path.resolve()
+        # Deep and wide: siblings prefetched at every level fall below the window
+        level = [root]
+        for _ in range(4):
+            level = [parent / f"d{i}" for parent in level for i in range(4)]
+            for d in level:
+                d.mkdir()
+        for d in [root, *root.rglob("*")]:
+            if d.is_dir():
+                (d / "f.txt").write_bytes(b"x")
+
+        # Directories read so far, counted where the pool threads open them
+        scanned = []
+        real_scandir = os.scandir
+
+        def counting_scandir(path):
+            scanned.append(path)  # list.append is atomic across pool threads
+            return real_scandir(path)
+
+        monkeypatch.setattr(os, "scandir", counting_scandir)
+        config = SafeWalkConfig(root=root, num_threads=2, max_unique_files=0)
+        window = config.num_threads * 4
+        consumed = 0
+        worst = 0
+        with SafeFileWalker(config) as w:
+            # One file per directory: each yielded file means one directory consumed
+            for _ in w:
+                time.sleep(0.001)  # Slow consumer: let the pool run ahead
+                consumed += 1
+                worst = max(worst, len(scanned) - consumed)
+
+        assert len(scanned) == consumed
+        assert worst <= window
+
+    def test_iter_str_and_with_stat(self, tmp_path):
+        """Test iter_str(), iter_fast_str() and iter_with_stat()."""
+        root = tmp_path.resolve()
+        (root / "data.bin").write_bytes(b"x" * 10)
+
+        # Without dedup the same walker can be iterated repeatedly
+        config = SafeWalkConfig(root=root, max_unique_files=0)
+        with SafeFileWalker(config) as w:
+            assert list(w.iter_str()) == [str(root / "data.bin")]
+            assert list(w.iter_fast_str()) == [str(root / "data.bin")]
+            results = list(w.iter_with_stat())
+
+        assert len(results) == 1
+        path, st = results[0]
+        assert path == root / "data.bin"
+        assert st.st_size == 10
+
+    @pytest.mark.parametrize("num_threads", [1, 2])
+    def test_iter_with_stat_follows_symlink_target(self, tmp_path, num_threads):
+        """Test that followed symlinks are paired with their target's stat."""
+        root = tmp_path.resolve()
+        (root / "data.bin").write_bytes(b"x" * 10)
+        os.symlink("data.bin", root / "link")
+        os.symlink("missing.bin", root / "dangling")
+
+        skipped = []
+        config = SafeWalkConfig(
+            root=root,
+            follow_symlinks=True,
+            num_threads=num_threads,
+            on_skip=lambda path, reason: skipped.append(reason),
+        )
+        with SafeFileWalker(config) as w:
+            results = list(w.iter_with_stat())
+
+        # data.bin itself and the link resolving to it
+        assert [path for path, _ in results] == [root / "data.bin", root / "data.bin"]
+        for _, st in results:
+            assert stat.S_ISREG(st.st_mode)
+            assert st.st_size == 10
+        assert skipped == ["stat_failed: FileNotFoundError"]
+
+    def test_iter_fast(self, tmp_path):
+        """Test that iter_fast() skips dedup and stat but keeps the sandbox."""
+        root = tmp_path.resolve()
+        (root / "file.txt").write_bytes(b"x" * 10)
+        os.link(root / "file.txt", root / "hardlink.txt")
+        (root / "subdir").mkdir()
+        (root / "subdir" / "nested.txt").write_bytes(b"x")
+
+        config = SafeWalkConfig(root=root, max_depth=1)
+        walker = SafeFileWalker(config)
+        with walker as w:
+            files = list(w.iter_fast())
+
+        # Hardlink is not deduplicated, depth limit still applies
+        assert files == [root / "file.txt", root / "hardlink.txt"]
+        assert walker.stats.bytes_processed == 0
+        assert walker.stats.dirs_skipped == 1
+
+    def test_dedup_cache_evicts_oldest(self, tmp_path):
+        """Test that a full dedup cache forgets the oldest inode first."""
+        root = tmp_path.resolve()
+        (root / "a.txt").write_bytes(b"a")
+        (root / "b.txt").write_bytes(b"b")
+        os.link(root / "a.txt", root / "c_link_a.txt")
+        os.link(root / "b.txt", root / "d_link_b.txt")
+
+        config = SafeWalkConfig(root=root, max_unique_files=2)
+        with SafeFileWalker(config) as w:
+            files = [p.name for p in w]
+
+        # c_link_a is a duplicate of a cached inode; d_link_b still is too
+        assert files == ["a.txt", "b.txt"]
+
+        config = SafeWalkConfig(root=root, max_unique_files=1)
+        with SafeFileWalker(config) as w:
+            files = [p.name for p in w]
+
+        # With room for one inode, a.txt is evicted by b.txt and c_link_a
+        # is yielded again; it then evicts b.txt, so d_link_b is yielded too
+        assert files == ["a.txt", "b.txt", "c_link_a.txt", "d_link_b.txt"]
+
+    def test_short_timeout_checked_per_entry(self, tmp_path):
+        """Test that short timeouts fire mid-directory even without rate limiting."""
+        root = tmp_path.resolve()
+        for i in range(3):
+            (root / f"file{i}.txt").write_bytes(b"x")
+
+        now = [0.0]
+        config = SafeWalkConfig(root=root, max_rate_mb_per_sec=float("inf"),
+                                timeout_sec=15.0, clock=lambda: now[0])
+        walker = SafeFileWalker(config)
+        files = iter(walker)
+        next(files)
+        now[0] = 20.0
+        with pytest.raises(TimeoutError):
+            next(files)
+        assert walker.stats.files_yielded == 1
+
+    def test_timeout_during_rate_limit_propagates(self, tmp_path):
+        """Test that a timeout hit while rate limiting is raised, not skipped."""
+        root = tmp_path.resolve()
+        for i in range(3):
+            (root / f"file{i}.txt").write_bytes(b"x" * 1024)
+
+        # Every clock read advances 10 seconds
+        ticks = [0.0]
+
+        def clock():
+            ticks[0] += 10.0
+            return ticks[0]
+
+        config = SafeWalkConfig(root=root, max_rate_mb_per_sec=1.0, timeout_sec=15, clock=clock)
+        walker = SafeFileWalker(config)
+        with pytest.raises(TimeoutError):
+            list(walker)
+
+        assert walker.stats.dirs_skipped == 0
+
+    @pytest.mark.skipif(os.name != "posix", reason="POSIX symlinks")
+    def test_follow_symlinks_resolution(self, tmp_path):
+        """Test that followed symlinks resolve like os.path.realpath."""
+        root = (tmp_path / "root").resolve()
+        outside = (tmp_path / "outside").resolve()
+        (root / "data").mkdir(parents=True)
+        (root / "links").mkdir()
+        outside.mkdir()
+        (root / "data" / "file.txt").write_bytes(b"x")
+        (outside / "secret.txt").write_bytes(b"x")
+        os.symlink("data", root / "datalink")
+
+        links = root / "links"
+        os.symlink("../data/file.txt", links / "relative")
+        os.symlink("relative", links / "chain")
+        os.symlink("../datalink/file.txt", links / "via_dir_link")
+        os.symlink("../datalink/../../outside/secret.txt", links / "escape")
+        # Dangling through a regular file (ENOTDIR): kept, like realpath(strict=False)
+        os.symlink("../data/file.txt/x", links / "through_file")
+
+        skipped = {}
+        config = SafeWalkConfig(
+            root=root,
+            follow_symlinks=True,
+            max_unique_files=0,
+            on_skip=lambda path, reason: skipped.setdefault(path.name, reason),
+        )
+        with SafeFileWalker(config) as w:
+            files = list(w.iter_str())
+
+        target = str(root / "data" / "file.txt")
+        # data/file.txt itself plus three links resolving to it
+        assert files.count(target) == 4
+        assert str(root / "data" / "file.txt" / "x") in files
+        assert "through_file" not in skipped
+        assert skipped["escape"] is SkipReason.TRAVERSAL_VIA_SYMLINK
+        assert skipped["escape"] == "traversal_via_symlink"
+
 
 class TestWalkStats:
     """Test statistics tracking."""
@@ -306,6 +678,24 @@ class TestWalkStats:
         assert "WalkStats" in repr_str
         assert "files_yielded=10" in repr_str
 
+    def test_stats_view_is_live(self, tmp_path):
+        root = tmp_path.resolve()
+        for i in range(3):
+            (root / f"file{i}.txt").write_bytes(b"x")
+
+        walker = SafeFileWalker(SafeWalkConfig(root=root))
+        view = walker.stats_view()
+        assert isinstance(view, WalkStatsView)
+        assert walker.stats_view() is view
+
+        seen = []
+        for _ in walker:
+            seen.append(view.files_yielded)
+
+        assert seen == [1, 2, 3]
+        assert view.bytes_processed == 3
+        assert view.time_elapsed >= 0
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
\ No newline at end of file